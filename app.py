@@ -1,6 +1,23 @@
+import functools
+import glob
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pv
+from pytrends.exceptions import ResponseError, TooManyRequestsError
 from pytrends.request import TrendReq
 
 st.set_page_config(
@@ -9,6 +26,32 @@ st.set_page_config(
 )
 
 DATA_PATH = "data/health_indicators_bwa.csv"
+ALL_BREAKDOWNS = "All breakdowns (average)"
+
+# Cleaned data is persisted here, keyed on the CSV contents, so it survives
+# restarts. Bump CLEAN_CACHE_VERSION whenever clean_who_botswana changes.
+CACHE_DIR = ".cache"
+CLEAN_CACHE_VERSION = 4
+
+# Number of (indicator, breakdown) yearly series each session keeps in memory
+YEARLY_CACHE_SIZE = 64
+
+# Seconds before a failed Google Trends fetch is retried on an ordinary
+# rerun (the Trends tab's refresh button retries straight away)
+TRENDS_RETRY_COOLDOWN = 5 * 60
+
+# Only the columns the cleaner needs, with their types declared up front so
+# the CSV reader does not have to infer them. Dictionary-encoded columns
+# arrive in pandas as categoricals.
+RAW_COLUMN_TYPES = {
+    "YEAR (DISPLAY)": pa.string(),
+    "Numeric": pa.float64(),
+    "GHO (CODE)": pa.dictionary(pa.int32(), pa.string()),
+    "GHO (DISPLAY)": pa.dictionary(pa.int32(), pa.string()),
+    "COUNTRY (DISPLAY)": pa.dictionary(pa.int32(), pa.string()),
+    "DIMENSION (TYPE)": pa.dictionary(pa.int32(), pa.string()),
+    "DIMENSION (NAME)": pa.dictionary(pa.int32(), pa.string()),
+}
 
 
 # --------------------------
@@ -25,131 +68,396 @@ def clean_who_botswana(df_raw: pd.DataFrame) -> pd.DataFrame:
     - Keep key columns for analysis
     """
 
-    df = df_raw.copy()
+    # Metadata rows and rows without numeric values, removed in one pass
+    mask = (
+        ~df_raw["YEAR (DISPLAY)"].str.startswith("#", na=False)
+        & ~df_raw["GHO (CODE)"].str.startswith("#", na=False)
+        & df_raw["Numeric"].notna()
+    )
+    df = df_raw.loc[mask]
+
+    # Keep relevant columns, with numeric year + value columns. Years fit in
+    # int16; values stay float64, as float32 rounding shows up in the KPIs
+    # and narratives (and can flip a trend label at the 10% threshold).
+    df = pd.DataFrame({
+        "GHO (CODE)": df["GHO (CODE)"],
+        "GHO (DISPLAY)": df["GHO (DISPLAY)"],
+        "year": pd.to_numeric(df["YEAR (DISPLAY)"], downcast="integer").astype("int16"),
+        "value": df["Numeric"].astype("float64"),
+        "COUNTRY (DISPLAY)": df["COUNTRY (DISPLAY)"],
+        "DIMENSION (TYPE)": df["DIMENSION (TYPE)"],
+        "DIMENSION (NAME)": df["DIMENSION (NAME)"],
+    })
+
+    # Create a breakdown label like "SEX – Both sexes" or "AGEGROUP – 0–27 days".
+    # Stored as a category: its categories come out sorted, and filtering
+    # compares integer codes rather than strings. The concat itself runs on
+    # Arrow-backed strings, as one C kernel instead of per-row Python strs.
+    dim_type = df["DIMENSION (TYPE)"].astype("string[pyarrow]").fillna("None")
+    dim_name = df["DIMENSION (NAME)"].astype("string[pyarrow]").fillna("All")
+    df["breakdown"] = pd.Categorical(dim_type + " – " + dim_name)
+
+    return df
+
+
+def _file_digest(path: str) -> str:
+    """Short content hash of a file, used to key the on-disk cache."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
 
-    # Remove metadata rows
-    df = df[~df["YEAR (DISPLAY)"].astype(str).str.startswith("#")]
-    df = df[~df["GHO (CODE)"].astype(str).str.startswith("#")]
+def _has_hxl_tag_row(path: str) -> bool:
+    """True if the row after the CSV header is an HXL "#indicator+..." tag row."""
+    with open(path, "rb") as f:
+        f.readline()
+        return f.readline().startswith(b"#")
 
-    # Drop rows without numeric values
-    df = df.dropna(subset=["Numeric"])
 
-    # Create numeric year + value columns
-    df["year"] = df["YEAR (DISPLAY)"].astype(int)
-    df["value"] = df["Numeric"].astype(float)
+def _read_raw_csv(path: str) -> pd.DataFrame:
+    """
+    Read the WHO CSV with PyArrow's multithreaded parser from a memory map,
+    parsing only the columns in RAW_COLUMN_TYPES.
+    """
+    read_options = pv.ReadOptions(
+        use_threads=True,
+        block_size=1 << 20,
+        # Skip the "#indicator+..." tag row (when present) so the typed
+        # columns parse; exports without one keep their first observation
+        skip_rows_after_names=1 if _has_hxl_tag_row(path) else 0,
+    )
+    convert_options = pv.ConvertOptions(
+        include_columns=list(RAW_COLUMN_TYPES),
+        column_types=RAW_COLUMN_TYPES,
+        # Same missing-value markers as pd.read_csv's defaults
+        null_values=[
+            "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+            "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+            "n/a", "nan", "null",
+        ],
+        strings_can_be_null=True,
+    )
+    with pa.memory_map(path, "r") as source:
+        table = pv.read_csv(source, read_options=read_options, convert_options=convert_options)
+    return table.to_pandas()
+
 
-    # Keep relevant columns
-    keep_cols = [
-        "GHO (CODE)", "GHO (DISPLAY)",
-        "year", "value",
-        "COUNTRY (DISPLAY)",
-        "DIMENSION (TYPE)", "DIMENSION (NAME)"
-    ]
-    df = df[keep_cols]
+def _remove_quietly(path: str) -> None:
+    """Delete a cache file, ignoring files that are already gone or locked."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
-    # Create a breakdown label like "SEX – Both sexes" or "AGEGROUP – 0–27 days"
-    dim_type = df["DIMENSION (TYPE)"].fillna("None")
-    dim_name = df["DIMENSION (NAME)"].fillna("All")
-    df["breakdown"] = dim_type + " – " + dim_name
 
+def _maybe_materialize_parquet(path: str) -> pd.DataFrame:
+    """
+    Return the cleaned data, using a Parquet copy in CACHE_DIR when possible.
+
+    The cache file name includes a hash of the CSV contents, so a changed CSV
+    is re-parsed and cleaned once and every later cold start just reads Parquet.
+    """
+    cache_path = os.path.join(
+        CACHE_DIR, f"clean_v{CLEAN_CACHE_VERSION}_{_file_digest(path)}.parquet"
+    )
+    if os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except (OSError, pa.ArrowException):
+            # The cache is disposable: drop a corrupt file and rebuild it
+            _remove_quietly(cache_path)
+
+    df = clean_who_botswana(_read_raw_csv(path))
+
+    # Write to a temp file and rename, so a crash never leaves a partial cache
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        # The index (each row's position in the CSV) is kept for load_data
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, cache_path)
+    except (OSError, pa.ArrowException):
+        # Read-only deployments still work, they just re-parse the CSV
+        if tmp_path is not None:
+            _remove_quietly(tmp_path)
+        return df
+
+    # Caches for older CSV contents or cleaner versions are never read again
+    for old_path in glob.glob(os.path.join(CACHE_DIR, "clean_v*_*.parquet")):
+        if old_path != cache_path:
+            _remove_quietly(old_path)
+
+    # Earlier versions kept the cache next to the CSV, inside data/
+    legacy_path = os.path.splitext(path)[0] + ".parquet"
+    if os.path.exists(legacy_path):
+        _remove_quietly(legacy_path)
     return df
 
 
 @st.cache_data(show_spinner=True)
 def load_data(path: str) -> pd.DataFrame:
     try:
-        raw = pd.read_csv(path)
+        df = _maybe_materialize_parquet(path)
     except Exception as e:
         st.error(f"Could not read data file at '{path}': {e}")
         return pd.DataFrame()
 
-    df = clean_who_botswana(raw)
-
     if df.empty:
         st.error("Data file loaded, but no valid rows after cleaning.")
-    return df
+        return df
+
+    # Sorted (indicator, breakdown) index so per-indicator lookups are index
+    # slices rather than full-column scans. The columns are kept as well; the
+    # index levels get their own names so the two never clash. The CSV row
+    # position is the last level, so the original row order can be restored.
+    return (
+        df.rename_axis("row_key")
+        .set_index(["GHO (DISPLAY)", "breakdown"], drop=False, append=True)
+        .rename_axis(["row_key", "indicator_key", "breakdown_key"])
+        .reorder_levels(["indicator_key", "breakdown_key", "row_key"])
+        .sort_index()
+    )
+
+
+@st.cache_data(show_spinner=False)
+def indicator_list() -> list[str]:
+    """Sorted indicator names, computed once rather than on every rerun."""
+    df = load_data(DATA_PATH)
+    return sorted(df["GHO (DISPLAY)"].unique())
+
+
+@st.cache_data(show_spinner=False)
+def breakdowns_by_indicator() -> dict[str, list[str]]:
+    """Sorted breakdown labels for every indicator, computed once."""
+    df = load_data(DATA_PATH)
+    return {
+        indicator: group["breakdown"].cat.remove_unused_categories().cat.categories.tolist()
+        for indicator, group in df.groupby("GHO (DISPLAY)", observed=True, sort=False)
+    }
+
+
+@st.cache_data(show_spinner=False)
+def year_bounds_by_indicator() -> dict[str, tuple[int, int]]:
+    """First and last year of data for every indicator, computed once."""
+    df = load_data(DATA_PATH)
+    bounds = df.groupby("GHO (DISPLAY)", observed=True, sort=False)["year"].agg(["min", "max"])
+    return {indicator: (int(lo), int(hi)) for indicator, lo, hi in bounds.itertuples()}
+
+
+def mean_by_year(years: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Average values per year, returned in ascending year order.
+
+    Years are small integers, so rows are bucketed with np.bincount instead
+    of a groupby. The per-year sums are Kahan-compensated in row order, like
+    pandas' groupby mean, so the results (and their rounding) match it.
+    """
+    if len(years) == 0:
+        return years, values
+
+    year_min = years.min()
+    offsets = years - year_min
+    counts = np.bincount(offsets)
+    present = np.flatnonzero(counts)
+    counts = counts[present]
+
+    # Rows grouped by year, keeping their original order within each year
+    order = np.argsort(offsets, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Add the k-th value of every year at once; years have few rows each
+    sums = np.zeros(len(present))
+    compensation = np.zeros(len(present))
+    for k in range(counts.max()):
+        live = counts > k
+        y = values[order[starts[live] + k]] - compensation[live]
+        t = sums[live] + y
+        compensation[live] = t - sums[live] - y
+        sums[live] = t
+
+    return present + year_min, sums / counts
 
 
 @st.cache_data(show_spinner=False)
+def get_yearly_arrays(indicator: str, breakdown: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Yearly (years, values) arrays for one indicator/breakdown over all years.
+    Averages across breakdowns when `breakdown` is ALL_BREAKDOWNS.
+    """
+    df = load_data(DATA_PATH)
+
+    if breakdown == ALL_BREAKDOWNS:
+        # Back in CSV order, so yearly sums add rows as pandas' groupby would
+        df_ind = df.loc[indicator].sort_index(level="row_key")
+    else:
+        df_ind = df.loc[(indicator, breakdown)]
+
+    # Aggregate by year (average if multiple breakdowns)
+    return mean_by_year(df_ind["year"].to_numpy(), df_ind["value"].to_numpy())
+
+
+def get_yearly(indicator: str, breakdown: str, year_lo: int, year_hi: int) -> pd.DataFrame:
+    """
+    Yearly values for one indicator/breakdown within a year range.
+
+    The full-range arrays are kept in session_state (LRU, YEARLY_CACHE_SIZE
+    entries), so moving the year slider only slices them with searchsorted.
+    """
+    cache = st.session_state.setdefault("yearly_cache", OrderedDict())
+    key = (indicator, breakdown)
+    if key in cache:
+        cache.move_to_end(key)
+    else:
+        cache[key] = get_yearly_arrays(indicator, breakdown)
+        if len(cache) > YEARLY_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    years, values = cache[key]
+    i0 = np.searchsorted(years, year_lo)
+    i1 = np.searchsorted(years, year_hi, side="right")
+    return pd.DataFrame({"year": years[i0:i1], "value": values[i0:i1]})
+
+
+@st.cache_resource
+def trends_cookies() -> dict:
+    """
+    Google's cookies for Trends requests. Fetching them costs a round trip,
+    so they are fetched once per process and shared by every client.
+    """
+    return TrendReq(hl="en-US", tz=120).cookies
+
+
+class SharedCookieTrendReq(TrendReq):
+    """TrendReq that reuses the shared cookies instead of fetching its own."""
+
+    def GetGoogleCookie(self):
+        return trends_cookies()
+
+
+@st.cache_data(ttl=24 * 3600, show_spinner=False)
 def get_google_trends(keyword: str, geo: str = "BW", timeframe: str = "2018-01-01 2025-12-31"):
     """
     Fetch Google Trends interest over time for a given keyword in Botswana.
+    Errors are raised (and so never cached); the caller reports them.
     """
     try:
-        pytrends = TrendReq(hl="en-US", tz=120)
+        # A cheap client per call (it holds per-query state), so fetches
+        # from different sessions run in parallel
+        pytrends = SharedCookieTrendReq(hl="en-US", tz=120)
         pytrends.build_payload([keyword], cat=0, timeframe=timeframe, geo=geo)
         trends_df = pytrends.interest_over_time()
+    except ResponseError as e:
+        # A non-429 error response usually means the cookies have gone
+        # stale, so fetch new ones next time. Rate limits and network errors
+        # keep them; the retry cooldown handles those.
+        if not isinstance(e, TooManyRequestsError):
+            trends_cookies.clear()
+        raise
+
+    if trends_df.empty:
+        return trends_df
 
-        if trends_df.empty:
-            return trends_df
+    if "isPartial" in trends_df.columns:
+        trends_df = trends_df.drop(columns=["isPartial"])
 
-        if "isPartial" in trends_df.columns:
-            trends_df = trends_df.drop(columns=["isPartial"])
+    return trends_df
 
-        return trends_df
 
-    except Exception as e:
-        st.warning(f"Could not load Google Trends data for '{keyword}': {e}")
-        return pd.DataFrame()
+def start_google_trends(keyword: str) -> Future:
+    """
+    Fetch Google Trends for `keyword` on a background thread, so the WHO tab
+    renders without waiting on the network. The result arrives on the future.
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(get_google_trends(keyword))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+# One regex for all description keywords, so a name is scanned once. The
+# named groups map to the descriptions below; rules listed earlier win when
+# a name matches several (e.g. "HIV ... infants" is described as child health).
+_DESCRIPTION_RE = re.compile(
+    r"(?P<child>infant|neonatal|under-five)"
+    r"|(?P<adolescent>adolescent)"
+    r"|(?P<maternal>maternal)"
+    r"|(?P<hiv>hiv)"
+    r"|(?P<tb>tb|tuberculosis)"
+    r"|(?P<suicide>suicide)",
+    re.IGNORECASE,
+)
+
+_DESCRIPTIONS = {
+    "child": (
+        "This indicator tracks deaths among very young children. "
+        "Higher values usually mean worse outcomes for child survival; "
+        "falling trends are a positive sign."
+    ),
+    "adolescent": (
+        "This indicator focuses on health outcomes among adolescents. "
+        "Monitoring this helps understand risk, injuries, and access to care for young people."
+    ),
+    "maternal": (
+        "This indicator relates to the health and survival of mothers during pregnancy, "
+        "childbirth, and the postnatal period. Lower mortality is better."
+    ),
+    "hiv": (
+        "This indicator describes HIV-related burden or services. "
+        "Declining mortality or incidence is usually good; increasing coverage of treatment is positive."
+    ),
+    "tb": (
+        "This indicator relates to tuberculosis burden or control. "
+        "Higher mortality or incidence is concerning; declining trends suggest better TB control."
+    ),
+    "suicide": (
+        "This indicator tracks deaths due to suicide. "
+        "Rising values can signal growing mental health and social stress challenges."
+    ),
+}
+
+_DEFAULT_DESCRIPTION = (
+    "This indicator reflects a specific health outcome or service coverage in Botswana. "
+    "Changes over time can signal improvements or emerging challenges in the health system."
+)
 
 
+@functools.lru_cache(maxsize=512)
 def describe_indicator(indicator_name: str) -> str:
     """
     Return a simple English description for some key indicators.
     Fallback: generic explanation.
     """
-    name = indicator_name.lower()
-
-    if "infant" in name or "neonatal" in name or "under-five" in name:
-        return (
-            "This indicator tracks deaths among very young children. "
-            "Higher values usually mean worse outcomes for child survival; "
-            "falling trends are a positive sign."
-        )
-    if "adolescent" in name:
-        return (
-            "This indicator focuses on health outcomes among adolescents. "
-            "Monitoring this helps understand risk, injuries, and access to care for young people."
-        )
-    if "maternal" in name:
-        return (
-            "This indicator relates to the health and survival of mothers during pregnancy, "
-            "childbirth, and the postnatal period. Lower mortality is better."
-        )
-    if "hiv" in name:
-        return (
-            "This indicator describes HIV-related burden or services. "
-            "Declining mortality or incidence is usually good; increasing coverage of treatment is positive."
-        )
-    if "tb" in name or "tuberculosis" in name:
-        return (
-            "This indicator relates to tuberculosis burden or control. "
-            "Higher mortality or incidence is concerning; declining trends suggest better TB control."
-        )
-    if "suicide" in name:
-        return (
-            "This indicator tracks deaths due to suicide. "
-            "Rising values can signal growing mental health and social stress challenges."
-        )
-
-    return (
-        "This indicator reflects a specific health outcome or service coverage in Botswana. "
-        "Changes over time can signal improvements or emerging challenges in the health system."
-    )
+    matched = {m.lastgroup for m in _DESCRIPTION_RE.finditer(indicator_name)}
+    for rule, description in _DESCRIPTIONS.items():
+        if rule in matched:
+            return description
+    return _DEFAULT_DESCRIPTION
 
 
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={pd.DataFrame: lambda d: (tuple(d["year"]), tuple(d["value"]))},
+)
 def classify_trend(df_yearly: pd.DataFrame) -> dict:
     """
     Classify the trend as increasing / decreasing / stable and compute percent change.
     Returns a small dict with narrative pieces.
     """
-    first_row = df_yearly.iloc[0]
-    last_row = df_yearly.iloc[-1]
+    years = df_yearly["year"].to_numpy()
+    values = df_yearly["value"].to_numpy()
 
-    start_year = int(first_row["year"])
-    end_year = int(last_row["year"])
-    start_val = first_row["value"]
-    end_val = last_row["value"]
+    start_year, end_year = int(years[0]), int(years[-1])
+    start_val, end_val = values[0], values[-1]
 
     absolute_change = end_val - start_val
     if start_val == 0:
@@ -179,50 +487,146 @@ def classify_trend(df_yearly: pd.DataFrame) -> dict:
     }
 
 
+# Narrative templates per trend label; anything else (e.g. "uncertain")
+# uses _DEFAULT_NARRATIVE.
+_NARRATIVES = {
+    "increasing": (
+        "Between {start_year} and {end_year}, this indicator increased "
+        "from {start_val_r} to {end_val_r}, a change of {pct_txt}. "
+        "This suggests a worsening of the measured burden if higher values are harmful, "
+        "or improvement if the indicator tracks coverage or access."
+    ),
+    "decreasing": (
+        "Between {start_year} and {end_year}, this indicator decreased "
+        "from {start_val_r} to {end_val_r}, a change of {pct_txt}. "
+        "For outcomes where high values are harmful (like deaths or mortality), "
+        "this pattern is generally positive."
+    ),
+    "relatively stable": (
+        "From {start_year} to {end_year}, this indicator stayed relatively stable "
+        "around {end_val_r}, with {pct_txt} change overall. "
+        "This may mean that major shifts in this health area have not yet occurred."
+    ),
+}
+
+_DEFAULT_NARRATIVE = (
+    "From {start_year} to {end_year}, this indicator changed from {start_val_r} to {end_val_r}. "
+    "More detailed context is needed to interpret whether this is good or bad for Botswana."
+)
+
+
 def make_trend_narrative(indicator_name: str, trend_info: dict) -> str:
     """
     Build a short national health narrative sentence about the trend.
     """
-    label = trend_info["label"]
-    start_year = trend_info["start_year"]
-    end_year = trend_info["end_year"]
-    start_val = trend_info["start_val"]
-    end_val = trend_info["end_val"]
     pct = trend_info["percent_change"]
-
-    # Round values for readability
-    start_val_r = round(start_val, 2)
-    end_val_r = round(end_val, 2)
     if pct is None:
         pct_txt = "an uncertain percentage change (starting value was zero)"
     else:
         pct_txt = f"about {pct:.1f}%"
 
-    if label == "increasing":
-        return (
-            f"Between {start_year} and {end_year}, this indicator increased "
-            f"from {start_val_r} to {end_val_r}, a change of {pct_txt}. "
-            f"This suggests a worsening of the measured burden if higher values are harmful, "
-            f"or improvement if the indicator tracks coverage or access."
-        )
-    if label == "decreasing":
-        return (
-            f"Between {start_year} and {end_year}, this indicator decreased "
-            f"from {start_val_r} to {end_val_r}, a change of {pct_txt}. "
-            f"For outcomes where high values are harmful (like deaths or mortality), "
-            f"this pattern is generally positive."
+    template = _NARRATIVES.get(trend_info["label"], _DEFAULT_NARRATIVE)
+    return template.format_map({
+        **trend_info,
+        # Round values for readability
+        "start_val_r": round(trend_info["start_val"], 2),
+        "end_val_r": round(trend_info["end_val"], 2),
+        "pct_txt": pct_txt,
+    })
+
+
+@st.cache_resource
+def who_chart_template() -> go.Figure:
+    """
+    Styled, empty line chart for the WHO indicator trend. Built once per
+    process; each rerun copies it and only fills in the data and title.
+    """
+    fig = go.Figure(go.Scatter(
+        mode="lines+markers",
+        line=dict(width=3),
+        hovertemplate="year=%{x}<br>value=%{y}<extra></extra>",
+    ))
+    fig.update_layout(
+        title_x=0.5,
+        hovermode="x unified",
+        margin=dict(l=40, r=20, t=60, b=40),
+    )
+    fig.update_xaxes(title="Year", showgrid=True)
+    fig.update_yaxes(title="Value", showgrid=True)
+    return fig
+
+
+def trends_future_for(keyword: str, retry: bool = False) -> Future:
+    """
+    This session's background Google Trends fetch for `keyword`, started on
+    first use and reused (in flight or finished) until the keyword changes.
+
+    A failed fetch is kept too, so reruns do not hammer Google (failures are
+    usually rate limits). It is retried once TRENDS_RETRY_COOLDOWN has passed
+    since it started, or straight away when `retry` is set.
+    """
+    trends_keyword, future, started_at = st.session_state.get("trends_future", (None, None, 0.0))
+    if trends_keyword == keyword:
+        failed = future.done() and future.exception() is not None
+        if not failed:
+            return future
+        if not retry and time.monotonic() - started_at < TRENDS_RETRY_COOLDOWN:
+            return future
+
+    future = start_google_trends(f"{keyword} Botswana")
+    st.session_state["trends_future"] = (keyword, future, time.monotonic())
+    return future
+
+
+@st.fragment
+def render_trends_tab(keyword: str):
+    """
+    Google Trends tab body. As a fragment, its refresh button reruns only
+    this tab instead of the whole app.
+    """
+    st.subheader("Google Search Interest in Related Topic (Botswana)")
+
+    st.write(f"Using keyword for Google Trends: **{keyword} Botswana**")
+
+    # The button's state is read before it is drawn, so a click retries a
+    # failed fetch on this (fragment) rerun
+    retry = st.session_state.get("trends_refresh", False)
+
+    try:
+        trends_df = trends_future_for(keyword, retry=retry).result(timeout=5)
+    except FutureTimeoutError:
+        trends_df = None
+    except Exception as e:
+        st.warning(f"Could not load Google Trends data for '{keyword} Botswana': {e}")
+        trends_df = pd.DataFrame()
+        st.button("🔄 Retry Google Trends", key="trends_refresh")
+
+    if trends_df is None:
+        st.info("Google Trends is still loading.")
+        st.button("🔄 Refresh Google Trends", key="trends_refresh")
+    elif trends_df.empty:
+        st.info("No Google Trends data returned for this topic / timeframe.")
+    else:
+        value_col = trends_df.columns[0]
+
+        fig_trends = px.line(
+            trends_df.reset_index(),
+            x="date",
+            y=value_col,
+            title=f"Google Search Interest over time – '{keyword} Botswana'"
         )
-    if label == "relatively stable":
-        return (
-            f"From {start_year} to {end_year}, this indicator stayed relatively stable "
-            f"around {end_val_r}, with {pct_txt} change overall. "
-            f"This may mean that major shifts in this health area have not yet occurred."
+        fig_trends.update_traces(line=dict(width=2))
+        fig_trends.update_layout(
+            title_x=0.5,
+            hovermode="x unified",
+            margin=dict(l=40, r=20, t=60, b=40),
         )
+        fig_trends.update_xaxes(title="Date", showgrid=True)
+        fig_trends.update_yaxes(title="Relative search interest (0–100)", showgrid=True)
+        st.plotly_chart(fig_trends, use_container_width=True)
 
-    return (
-        f"From {start_year} to {end_year}, this indicator changed from {start_val_r} to {end_val_r}. "
-        f"More detailed context is needed to interpret whether this is good or bad for Botswana."
-    )
+        with st.expander("Show Google Trends data table"):
+            st.dataframe(trends_df, use_container_width=True)
 
 
 # --------------------------
@@ -254,7 +658,7 @@ with st.sidebar:
         st.rerun()
 
     # Indicator selection
-    indicator_names = sorted(df["GHO (DISPLAY)"].unique())
+    indicator_names = indicator_list()
     selected_indicator = st.selectbox(
         "📊 Select indicator",
         options=indicator_names,
@@ -262,12 +666,9 @@ with st.sidebar:
         key="indicator"
     )
 
-    # Subset for this indicator
-    df_ind_all = df[df["GHO (DISPLAY)"] == selected_indicator]
-
     # Breakdown selection (e.g., "SEX – Both sexes", "AGEGROUP – 0–27 days")
-    breakdown_options = sorted(df_ind_all["breakdown"].unique())
-    breakdown_options_display = ["All breakdowns (average)"] + breakdown_options
+    breakdown_options = breakdowns_by_indicator()[selected_indicator]
+    breakdown_options_display = [ALL_BREAKDOWNS] + breakdown_options
 
     # Determine default index for breakdown
     if "breakdown" in st.session_state and st.session_state["breakdown"] in breakdown_options_display:
@@ -283,8 +684,7 @@ with st.sidebar:
     )
 
     # Year range slider with single-year protection
-    min_year = int(df_ind_all["year"].min())
-    max_year = int(df_ind_all["year"].max())
+    min_year, max_year = year_bounds_by_indicator()[selected_indicator]
 
     if min_year == max_year:
         st.info(f"Only data for year {min_year} is available for this indicator/breakdown.")
@@ -306,20 +706,15 @@ with st.sidebar:
             key="year_range"
         )
 
-# Apply filters to data
-df_ind = df[df["GHO (DISPLAY)"] == selected_indicator]
-df_ind = df_ind[(df_ind["year"] >= year_range[0]) & (df_ind["year"] <= year_range[1])]
+# Build a simple Google Trends keyword from the indicator text and start
+# fetching it now, while the WHO tab is computed and rendered
+keyword = selected_indicator.split(",")[0].split("(")[0]
+keyword = keyword[:80]  # avoid very long strings
 
-if selected_breakdown != "All breakdowns (average)":
-    df_ind = df_ind[df_ind["breakdown"] == selected_breakdown]
+trends_future_for(keyword)
 
-# Aggregate by year (average if multiple breakdowns)
-df_yearly = (
-    df_ind
-    .groupby("year", as_index=False)["value"]
-    .mean()
-    .sort_values("year")
-)
+# Apply filters and aggregate by year
+df_yearly = get_yearly(selected_indicator, selected_breakdown, year_range[0], year_range[1])
 
 if df_yearly.empty:
     st.warning("No data available for this combination of indicator, breakdown, and years.")
@@ -337,15 +732,16 @@ with tab1:
     st.subheader(selected_indicator)
 
     # KPIs
-    latest_row = df_yearly.iloc[-1]
-    latest_year = int(latest_row["year"])
-    latest_value = latest_row["value"]
-
-    if len(df_yearly) > 1:
-        prev_row = df_yearly.iloc[-2]
-        change_abs = latest_value - prev_row["value"]
-        if prev_row["value"] != 0:
-            change_pct = (change_abs / prev_row["value"]) * 100.0
+    years = df_yearly["year"].to_numpy()
+    values = df_yearly["value"].to_numpy()
+    latest_year = int(years[-1])
+    latest_value = float(values[-1])
+
+    if len(values) > 1:
+        prev_value = float(values[-2])
+        change_abs = latest_value - prev_value
+        if prev_value != 0:
+            change_pct = (change_abs / prev_value) * 100.0
         else:
             change_pct = None
     else:
@@ -373,57 +769,14 @@ with tab1:
     st.write(narrative)
 
     # Line chart over years
-    fig = px.line(
-        df_yearly,
-        x="year",
-        y="value",
-        markers=True,
-        title=f"{selected_indicator} – Botswana"
-    )
-    fig.update_traces(line=dict(width=3))
-    fig.update_layout(
-        title_x=0.5,
-        hovermode="x unified",
-        margin=dict(l=40, r=20, t=60, b=40),
-    )
-    fig.update_xaxes(title="Year", showgrid=True)
-    fig.update_yaxes(title="Value", showgrid=True)
+    fig = go.Figure(who_chart_template())
+    fig.data[0].x = years
+    fig.data[0].y = values
+    fig.layout.title.text = f"{selected_indicator} – Botswana"
     st.plotly_chart(fig, use_container_width=True)
 
     st.markdown("#### Data table")
     st.dataframe(df_yearly, use_container_width=True)
 
 with tab2:
-    st.subheader("Google Search Interest in Related Topic (Botswana)")
-
-    # Build a simple keyword from the indicator text
-    keyword = selected_indicator.split(",")[0].split("(")[0]
-    keyword = keyword[:80]  # avoid very long strings
-
-    st.write(f"Using keyword for Google Trends: **{keyword} Botswana**")
-
-    trends_df = get_google_trends(keyword=f"{keyword} Botswana")
-
-    if trends_df.empty:
-        st.info("No Google Trends data returned for this topic / timeframe.")
-    else:
-        value_col = trends_df.columns[0]
-
-        fig_trends = px.line(
-            trends_df.reset_index(),
-            x="date",
-            y=value_col,
-            title=f"Google Search Interest over time – '{keyword} Botswana'"
-        )
-        fig_trends.update_traces(line=dict(width=2))
-        fig_trends.update_layout(
-            title_x=0.5,
-            hovermode="x unified",
-            margin=dict(l=40, r=20, t=60, b=40),
-        )
-        fig_trends.update_xaxes(title="Date", showgrid=True)
-        fig_trends.update_yaxes(title="Relative search interest (0–100)", showgrid=True)
-        st.plotly_chart(fig_trends, use_container_width=True)
-
-        with st.expander("Show Google Trends data table"):
-            st.dataframe(trends_df, use_container_width=True)
\ No newline at end of file
+    render_trends_tab(keyword)